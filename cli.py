@@ -52,12 +52,12 @@ def main():
 
     try:
         # Read input file
-        with open(args.input_file, encoding="utf-8") as file:
-            markdown_content = file.read()
+        markdown_content = Path(args.input_file).read_text(encoding="utf-8")
 
         # Parse markdown
         parser_obj = MarkdownParser()
         requests = parser_obj.parse(markdown_content)
+        folders = {req.folder for req in requests if req.folder}
 
         if args.verbose:
             print(f"Parsed {len(requests)} requests from {args.input_file}")
@@ -76,7 +76,6 @@ def main():
             print("✅ Markdown structure validation:")
             print(f"  Requests found: {len(requests)}")
 
-            folders = set(req.folder for req in requests if req.folder)
             print(f"  Folders: {len(folders)}")
             if folders:
                 for folder in sorted(folders):
@@ -123,7 +122,7 @@ def main():
         print(f"   Input: {args.input_file}")
         print(f"   Output: {output_file}")
         print(f"   Requests: {len(requests)}")
-        print(f"   Folders: {len(set(req.folder for req in requests if req.folder))}")
+        print(f"   Folders: {len(folders)}")
         print(f"   Variables: {len(collection.get('variable', []))}")
 
         return 0
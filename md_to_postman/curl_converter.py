@@ -5,9 +5,121 @@ cURL command parser and converter to structured request format.
 import json
 import re
 import shlex
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qsl, urlsplit
+
+# Pattern to find Postman variables {{var_name}}
+POSTMAN_VAR_RE = re.compile(r"\{\{([^}]+)\}\}")
+
+# shared result for text without variables, so the common case allocates nothing
+_EMPTY_SET: frozenset[str] = frozenset()
+
+# Matches one whitespace separated word: a double quoted string, a single
+# quoted string or a plain word. Line continuations count as whitespace.
+# Whitespace is the set shlex splits on, not Unicode whitespace (e.g. NBSP)
+_TOKEN_RE = re.compile(
+    r"""(?:[ \t\r\n]|\\\n)*"""
+    r"""(?:"((?:[^"\\]|\\.)*)"|'([^']*)'|([^ \t\r\n"'\\]+))"""
+    r"""(?=[ \t\r\n]|\\\n|$)"""
+)
+_SHELL_WHITESPACE = " \t\r\n"
+_DQUOTE_ESCAPE_RE = re.compile(r'\\(["\\])')
+
+
+def tokenize_curl(curl_command: str) -> list[str]:
+    """Split a cURL command into shell words.
+
+    Handles the common quoting found in cURL commands with a single regex
+    sweep and falls back to shlex for anything unusual (escapes outside of
+    quotes, words glued to quoted strings, unbalanced quotes).
+    """
+    tokens = []
+    pos = 0
+    end = len(curl_command.rstrip(_SHELL_WHITESPACE))
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(curl_command, pos)
+        if m is None:
+            return _shlex_tokenize(curl_command)
+        double_quoted, single_quoted, word = m.groups()
+        if double_quoted is not None:
+            if "\\" in double_quoted:
+                double_quoted = _DQUOTE_ESCAPE_RE.sub(r"\1", double_quoted)
+            tokens.append(double_quoted)
+        elif single_quoted is not None:
+            tokens.append(single_quoted)
+        else:
+            tokens.append(word)
+        pos = m.end()
+    return tokens
+
+
+def extract_postman_variables(text: str) -> frozenset[str]:
+    """Extract the unique Postman variable names from text."""
+    variables: set[str] = set()
+    harvest_postman_variables(text, variables)
+    return frozenset(variables) if variables else _EMPTY_SET
+
+
+def harvest_postman_variables(text: str | None, variables: set[str]) -> None:
+    """Add the Postman variable names found in text to variables."""
+    # most text has no variables at all, skip the regex for it
+    if text and "{{" in text:
+        variables.update(POSTMAN_VAR_RE.findall(text))
+
+
+def may_be_json_body(raw_body: str) -> bool:
+    """Whether a request body is worth parsing as JSON.
+
+    Only objects and arrays are treated as JSON bodies, so anything else
+    (form data, plain text, bare scalars) skips the JSON parse.
+    """
+    return raw_body.lstrip()[:1] in ("{", "[")
+
+
+def reindent_json(raw_body: str) -> str:
+    """Re-indent a JSON document with 2 spaces.
+
+    Uses the stdlib json module rather than orjson, which would turn integers
+    wider than 64 bits into floats and silently change the body.
+    """
+    return json.dumps(json.loads(raw_body), indent=2, ensure_ascii=False)
+
+
+def _shlex_tokenize(curl_command: str) -> list[str]:
+    """Split a cURL command into tokens using shlex to handle quotes properly."""
+    try:
+        return shlex.split(curl_command)
+    except ValueError:
+        return curl_command.split()
+
+
+def _build_request(
+    method: str,
+    headers: list[dict[str, str]],
+    url: dict[str, Any],
+    body: dict[str, Any] | None,
+    description: str,
+) -> dict[str, Any]:
+    """Build the request part of a Postman item with a fixed key order.
+
+    Every request is created with the same keys in the same order; optional
+    fields that are absent are dropped afterwards.
+    """
+    request = {
+        "method": method,
+        "header": headers,
+        "url": url,
+        "body": body,
+        "description": description,
+    }
+    if not body:
+        del request["body"]
+    if not description:
+        del request["description"]
+    return request
 
 
 @dataclass
@@ -19,6 +131,10 @@ class ParsedCurl:
     headers: dict[str, str]
     body: str | None = None
     query_params: dict[str, str] | None = None
+    # URL exactly as written in the command, query string included
+    raw_url: str | None = None
+    # every query parameter in order, repeated keys included
+    query_pairs: list[tuple[str, str]] | None = None
 
     def __post_init__(self):
         if self.query_params is None:
@@ -34,8 +150,18 @@ class CurlConverter:
         self.data_flags = {"-d", "--data", "--data-raw", "--data-binary"}
         self.json_flags = {"--json"}
 
-        # Pattern to find Postman variables {{var_name}}
-        self.postman_var_pattern = re.compile(r"\{\{([^}]+)\}\}")
+        self.postman_var_pattern = POSTMAN_VAR_RE
+
+        # map every handled flag to its handler so each token needs a single
+        # dict lookup instead of a membership test per flag group
+        self._flag_handlers: dict[str, Callable[[list[str], int, ParsedCurl], int]] = {}
+        for flags, handler in (
+            (self.method_flags, self._set_method),
+            (self.header_flags, self._set_header),
+            (self.data_flags, self._set_data),
+            (self.json_flags, self._set_json),
+        ):
+            self._flag_handlers.update(dict.fromkeys(flags, handler))
 
     def parse_curl(self, curl_command: str) -> ParsedCurl:
         """Parse a cURL command string into structured components."""
@@ -43,117 +169,103 @@ class CurlConverter:
         if curl_command.startswith("curl "):
             curl_command = curl_command[5:]
 
-        # Split the command into tokens using shlex to handle quotes properly
-        try:
-            tokens = shlex.split(curl_command)
-        except ValueError:
-            tokens = curl_command.split()
+        tokens = tokenize_curl(curl_command)
 
-        method = "GET"  # Default method
-        url = ""
-        headers = {}
-        body = None
+        state = ParsedCurl(method="GET", url="", headers={})
+        flag_handlers = self._flag_handlers
+        n = len(tokens)
 
         i = 0
-        while i < len(tokens):
+        while i < n:
             token = tokens[i]
 
-            # get method flag
-            if token in self.method_flags and i + 1 < len(tokens):
-                method = tokens[i + 1].upper()
-                i += 2
-                continue
-
-            # get header flag
-            if token in self.header_flags and i + 1 < len(tokens):
-                header_value = tokens[i + 1]
-                if ":" in header_value:
-                    header_name, header_val = header_value.split(":", 1)
-                    headers[header_name.strip()] = header_val.strip()
-                i += 2
-                continue
-
-            # get data flag
-            if token in self.data_flags and i + 1 < len(tokens):
-                body = tokens[i + 1]
-                if method == "GET":  # If data is provided but no method, assume POST
-                    method = "POST"
-                i += 2
-                continue
-
-            # get JSON flag
-            if token in self.json_flags and i + 1 < len(tokens):
-                body = tokens[i + 1]
-                headers["Content-Type"] = "application/json"
-                if method == "GET":
-                    method = "POST"
-                i += 2
+            handler = flag_handlers.get(token)
+            if handler is not None and i + 1 < n:
+                i = handler(tokens, i, state)
                 continue
 
             # skip other flags we don't handle fn
             if token.startswith("-"):
                 # Try to skip flag and its value if it has one
-                if i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
+                if i + 1 < n and not tokens[i + 1].startswith("-"):
                     i += 2
                 else:
                     i += 1
                 continue
 
             # check for the URL
-            if not url and not token.startswith("-"):
-                url = token
+            if not state.url:
+                state.url = state.raw_url = token
 
             i += 1
 
         # parse query parameters from URL
-        query_params = {}
-        if "?" in url:
-            parsed_url = urlparse(url)
-            query_params = {
-                k: v[0] if v else "" for k, v in parse_qs(parsed_url.query).items()
-            }
-
-            url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
-
-        return ParsedCurl(
-            method=method,
-            url=url,
-            headers=headers,
-            body=body,
-            query_params=query_params,
-        )
-
-    def extract_postman_variables(self, text: str) -> list[str]:
-        """Extract Postman variable names from text."""
-        if not text:
-            return []
-
-        matches = self.postman_var_pattern.findall(text)
-        return list(set(matches))
+        if "?" in state.url:
+            parsed_url = urlsplit(state.url)
+            # parse_qsl avoids the per-key lists built by parse_qs; the first
+            # value of a repeated key wins in query_params, as before, while
+            # query_pairs keeps them all to match the raw URL
+            state.query_pairs = parse_qsl(parsed_url.query, keep_blank_values=True)
+            query_params = state.query_params
+            for key, value in state.query_pairs:
+                query_params.setdefault(key, value)
+
+            state.url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
+
+        return state
+
+    def _set_method(self, tokens: list[str], i: int, state: ParsedCurl) -> int:
+        """Handle a method flag such as ``-X POST``."""
+        state.method = tokens[i + 1].upper()
+        return i + 2
+
+    def _set_header(self, tokens: list[str], i: int, state: ParsedCurl) -> int:
+        """Handle a header flag such as ``-H "Accept: */*"``."""
+        header_name, sep, header_val = tokens[i + 1].partition(":")
+        if sep:
+            state.headers[header_name.strip()] = header_val.strip()
+        return i + 2
+
+    def _set_data(self, tokens: list[str], i: int, state: ParsedCurl) -> int:
+        """Handle a data flag such as ``-d '{"key": "value"}'``."""
+        state.body = tokens[i + 1]
+        if state.method == "GET":  # If data is provided but no method, assume POST
+            state.method = "POST"
+        return i + 2
+
+    def _set_json(self, tokens: list[str], i: int, state: ParsedCurl) -> int:
+        """Handle a ``--json`` flag, which also implies a JSON content type."""
+        state.body = tokens[i + 1]
+        state.headers["Content-Type"] = "application/json"
+        if state.method == "GET":
+            state.method = "POST"
+        return i + 2
+
+    def extract_postman_variables(self, text: str) -> frozenset[str]:
+        """Extract the unique Postman variable names from text."""
+        return extract_postman_variables(text)
 
     def get_all_variables(self, parsed_curl: ParsedCurl) -> list[str]:
         """Get all Postman variables used in the request."""
-        variables = []
+        variables = set()
 
-        # check url
-        variables.extend(self.extract_postman_variables(parsed_curl.url))
+        # check url and body
+        harvest_postman_variables(parsed_curl.url, variables)
+        harvest_postman_variables(parsed_curl.body, variables)
 
-        # check headers
-        for header_name, header_value in parsed_curl.headers.items():
-            variables.extend(self.extract_postman_variables(header_name))
-            variables.extend(self.extract_postman_variables(header_value))
-
-        # check body
-        if parsed_curl.body:
-            variables.extend(self.extract_postman_variables(parsed_curl.body))
+        # check headers and query parameters
+        for pairs in (parsed_curl.headers.items(), self._query_items(parsed_curl)):
+            for name, value in pairs:
+                harvest_postman_variables(name, variables)
+                harvest_postman_variables(value, variables)
 
-        # check query parameters
-        if parsed_curl.query_params:
-            for param_name, param_value in parsed_curl.query_params.items():
-                variables.extend(self.extract_postman_variables(param_name))
-                variables.extend(self.extract_postman_variables(param_value))
+        return list(variables)
 
-        return list(set(variables))  # Remove duplicates
+    def _query_items(self, parsed_curl: ParsedCurl) -> Iterable[tuple[str, str]]:
+        """Query parameters of a parsed cURL command, repeated keys included."""
+        if parsed_curl.query_pairs is not None:
+            return parsed_curl.query_pairs
+        return (parsed_curl.query_params or {}).items()
 
     def to_postman_request(
         self, parsed_curl: ParsedCurl, name: str, description: str = ""
@@ -168,56 +280,55 @@ class CurlConverter:
 
         # build query parameters array
         query_array = []
-        if parsed_curl.query_params:
-            for param_name, param_value in parsed_curl.query_params.items():
-                query_array.append({"key": param_name, "value": param_value})
+        for param_name, param_value in self._query_items(parsed_curl):
+            query_array.append({"key": param_name, "value": param_value})
 
         # build request body
         body = None
-        if parsed_curl.body:
-            try:
-                json_data = json.loads(parsed_curl.body)
-                body = {
-                    "mode": "raw",
-                    "raw": json.dumps(json_data, indent=2),
-                    "options": {"raw": {"language": "json"}},
-                }
-            except (json.JSONDecodeError, TypeError):
+        raw_body = parsed_curl.body
+        if raw_body:
+            if may_be_json_body(raw_body):
+                try:
+                    body = {
+                        "mode": "raw",
+                        "raw": reindent_json(raw_body),
+                        "options": {"raw": {"language": "json"}},
+                    }
+                except json.JSONDecodeError:
+                    pass
+
+            if body is None:
                 # if not valid JSON, treat as raw text
-                body = {"mode": "raw", "raw": parsed_curl.body}
-
-        request = {
+                body = {"mode": "raw", "raw": raw_body}
+
+        # parse the url once and reuse its components
+        parsed_url = urlsplit(parsed_curl.url)
+        scheme = parsed_url.scheme or "https"
+        netloc = parsed_url.netloc or ""
+        path = parsed_url.path or "/"
+        host_parts = netloc.split(".") if netloc else []
+        path_parts = path.strip("/").split("/") if path != "/" else []
+
+        # reuse the URL as written when we have it instead of rebuilding the
+        # query string from the parsed parameters
+        raw_url = parsed_curl.raw_url
+        if raw_url is None:
+            raw_url = parsed_curl.url
+            if parsed_curl.query_params:
+                raw_url += "?" + "&".join(
+                    [f"{k}={v}" for k, v in parsed_curl.query_params.items()]
+                )
+
+        url = {
+            "raw": raw_url,
+            "protocol": scheme,
+            "host": host_parts,
+            "path": path_parts,
+            "query": query_array,
+        }
+        return {
             "name": name,
-            "request": {
-                "method": parsed_curl.method,
-                "header": headers_array,
-                "url": {
-                    "raw": parsed_curl.url
-                    + (
-                        "?"
-                        + "&".join(
-                            f"{k}={v}" for k, v in parsed_curl.query_params.items()
-                        )
-                        if parsed_curl.query_params
-                        else ""
-                    ),
-                    "protocol": urlparse(parsed_curl.url).scheme or "https",
-                    "host": (urlparse(parsed_curl.url).netloc or "").split("."),
-                    "path": (urlparse(parsed_curl.url).path or "/")
-                    .strip("/")
-                    .split("/")
-                    if urlparse(parsed_curl.url).path
-                    and urlparse(parsed_curl.url).path != "/"
-                    else [],
-                    "query": query_array,
-                },
-            },
+            "request": _build_request(
+                parsed_curl.method, headers_array, url, body, description
+            ),
         }
-
-        if body:
-            request["request"]["body"] = body
-
-        if description:
-            request["request"]["description"] = description
-
-        return request
@@ -4,6 +4,21 @@ Markdown parser for extracting cURL requests and metadata.
 
 import re
 from dataclasses import dataclass
+from pathlib import Path
+
+# single pass over the document: folder (H1) and request (H2) headings,
+# metadata fields (key and value; value can be empty) and cURL blocks. Other
+# fenced blocks are consumed whole so that lines inside them (e.g. a "# comment"
+# in a bash block) are not mistaken for headings
+_DOCUMENT_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"(?P<heading>#{1,2}) (?P<title>[^\n]*)"
+    r"|\*\*(?P<key>[^:\n]+):\*\*[ \t]*(?P<value>[^\n]*)"
+    r"|```curl\n(?P<curl>.*?)\n```"
+    r"|```[^\n]*\n.*?\n```"
+    r")",
+    re.MULTILINE | re.DOTALL,
+)
 
 
 @dataclass
@@ -29,96 +44,65 @@ class MarkdownParser:
     """Parser for structured markdown files containing cURL requests."""
 
     def __init__(self):
-        self.metadata_pattern = re.compile(
-            r"^\*\*([^:]+):\*\*\s*(.*)$"
-        )  # matches key and value; value can be empty
-        self.curl_block_pattern = re.compile(r"```curl\n(.*?)\n```", re.DOTALL)
+        self.document_pattern = _DOCUMENT_RE
 
     def parse(self, markdown_content: str) -> list[ParsedRequest]:
         """Parse markdown content and extract structured requests."""
-        lines = markdown_content.split("\n")
         requests = []
         current_folder = None
-        i = 0
+        request_name = None
+        metadata = RequestMetadata()
 
-        while i < len(lines):
-            line = lines[i].strip()
+        for match in self.document_pattern.finditer(markdown_content):
+            heading = match.group("heading")
 
-            if line.startswith("# ") and not line.startswith("## "):
-                current_folder = line[2:].strip()
-                i += 1
+            if heading == "#":
+                current_folder = match.group("title").strip()
+                request_name = None
                 continue
 
             # Check for request name H2 ( which is mapped as the request item
             # with a folder (which is mapped as H1)
-            if line.startswith("## "):
-                request_name = line[3:].strip()
-                metadata, curl_command, next_i = self._parse_request_block(lines, i + 1)
+            if heading == "##":
+                request_name = match.group("title").strip()
+                metadata = RequestMetadata()
+                continue
 
-                if curl_command:
-                    parsed_request = ParsedRequest(
+            # anything outside of a request block is ignored
+            if request_name is None:
+                continue
+
+            curl_command = match.group("curl")
+            if curl_command is not None:
+                requests.append(
+                    ParsedRequest(
                         name=request_name,
                         metadata=metadata,
-                        curl_command=curl_command,
+                        curl_command=curl_command.strip(),
                         folder=current_folder,
                     )
-                    requests.append(parsed_request)
-
-                i = next_i
+                )
+                # only the first cURL block of a request is used
+                request_name = None
                 continue
 
-            i += 1
-
-        return requests
-
-    def _parse_request_block(
-        self, lines: list[str], start_index: int
-    ) -> tuple[RequestMetadata, str | None, int]:
-        """Parse a single request block starting from the given index."""
-        metadata = RequestMetadata()
-        curl_command = None
-        i = start_index
-
-        while i < len(lines):
-            line = lines[i].strip()
-
-            if line.startswith("#") or (
-                not line
-                and i + 1 < len(lines)
-                and lines[i + 1].strip().startswith("```")
-            ):
-                break
-
-            if line:
-                match = self.metadata_pattern.match(line)
-                if match:
-                    field_name = match.group(1).strip().lower().replace(" ", "_")
-                    field_value = match.group(2).strip()
-
-                    if field_name == "description":
-                        metadata.description = field_value
-                    elif field_name == "requires":
-                        metadata.requires = field_value
-                    elif field_name == "save_response_variable":
-                        metadata.save_response_variable = field_value
-
-            i += 1
-
-        # check for cURL block
-        remaining_content = "\n".join(lines[i:])
-        curl_match = self.curl_block_pattern.search(remaining_content)
+            field_key = match.group("key")
+            if field_key is None:
+                # some other fenced block, nothing to extract from it
+                continue
 
-        if curl_match:
-            curl_command = curl_match.group(1).strip()
-            curl_block_lines = curl_match.group(0).count("\n")
+            field_name = field_key.strip().lower().replace(" ", "_")
+            field_value = match.group("value").strip()
 
-            curl_start_newlines = remaining_content[: curl_match.start()].count("\n")
-            i += curl_block_lines + curl_start_newlines
+            if field_name == "description":
+                metadata.description = field_value
+            elif field_name == "requires":
+                metadata.requires = field_value
+            elif field_name == "save_response_variable":
+                metadata.save_response_variable = field_value
 
-        return metadata, curl_command, i
+        return requests
 
     def parse_file(self, file_path: str) -> list[ParsedRequest]:
         """Parse a markdown file and return parsed requests."""
-        with open(file_path, encoding="utf-8") as file:
-            content = file.read()
-        return self.parse(content)
+        return self.parse(Path(file_path).read_text(encoding="utf-8"))
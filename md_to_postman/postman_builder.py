@@ -2,126 +2,247 @@
 Postman Collection builder for creating v2.1 collection JSON.
 """
 
-import json
-import re
-import shlex
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
 from typing import Any
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import SplitResult, parse_qsl, urlsplit
+
+import orjson
+
+from md_to_postman.curl_converter import (
+    POSTMAN_VAR_RE,
+    extract_postman_variables,
+    harvest_postman_variables,
+    may_be_json_body,
+    reindent_json,
+    tokenize_curl,
+)
+
+# orjson serializes straight to UTF-8 bytes, so files can be written without
+# an intermediate str decode
+_dumps_bytes = orjson.dumps
+
+
+def _dumps_option(pretty: bool) -> int:
+    """orjson options for pretty (2-space indented) or compact output."""
+    return orjson.OPT_INDENT_2 if pretty else 0
+
+
+_SCHEMA_URL = "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+
+_METHOD_FLAGS = frozenset({"-X", "--request"})
+_HEADER_FLAGS = frozenset({"-H", "--header"})
+_DATA_FLAGS = frozenset({"-d", "--data", "--data-raw", "--data-binary"})
+_JSON_FLAGS = frozenset({"--json"})
+
+# flag -> the kind of value it takes, so tokens are classified in one lookup
+_FLAG_KIND = {
+    **dict.fromkeys(_METHOD_FLAGS, "method"),
+    **dict.fromkeys(_HEADER_FLAGS, "header"),
+    **dict.fromkeys(_DATA_FLAGS, "data"),
+    **dict.fromkeys(_JSON_FLAGS, "json"),
+}
+
+
+# Scripts depend only on their argument and the same variables tend to repeat
+# across requests (auth tokens, ids), so they are cached; tuples keep the
+# shared cache entries immutable
+@lru_cache(maxsize=256)
+def _save_variable_script(variable_name: str) -> tuple[str, ...]:
+    """Test script lines that save response data to a variable."""
+    return (
+        "// Save response data to variable",
+        "const responseJson = pm.response.json();",
+        (
+            f"pm.environment.set('{variable_name}', "
+            "responseJson.token || "
+            "responseJson.access_token || "
+            "responseJson.id || "
+            "JSON.stringify(responseJson)"
+            ");"
+        ),
+    )
+
+
+@lru_cache(maxsize=256)
+def _prereq_script(required_vars: str) -> tuple[str, ...]:
+    """Pre-request script lines that check required variables are set."""
+    vars_list = [var.strip() for var in required_vars.split(",")]
+    script_lines = ["// Check required variables"]
+
+    for var in vars_list:
+        script_lines.extend(
+            [
+                f"if (!pm.environment.get('{var}')) {{",
+                f"    throw new Error('Required variable {var} is not set');",
+                "}",
+            ]
+        )
+
+    return tuple(script_lines)
 
 
 class PostmanCollectionBuilder:
     """Builds Postman Collection v2.1 JSON from parsed requests."""
 
-    def __init__(self):
-        # Pattern to find Postman variables {{var_name}}
-        self.postman_var_pattern = re.compile(r"\{\{([^}]+)\}\}")
-        self.method_flags = {"-X", "--request"}
-        self.header_flags = {"-H", "--header"}
-        self.data_flags = {"-d", "--data", "--data-raw", "--data-binary"}
-        self.json_flags = {"--json"}
+    def __init__(self, pretty_json_bodies: bool = False):
+        # re-indent JSON request bodies instead of keeping them as written
+        self.pretty_json_bodies = pretty_json_bodies
+
+        self.postman_var_pattern = POSTMAN_VAR_RE
+        self.method_flags = _METHOD_FLAGS
+        self.header_flags = _HEADER_FLAGS
+        self.data_flags = _DATA_FLAGS
+        self.json_flags = _JSON_FLAGS
+
+        # parse_curl_simple results keyed by the raw cURL command
+        self._curl_cache: dict[str, dict[str, Any]] = {}
 
     def parse_curl_simple(self, curl_command: str) -> dict[str, Any]:
-        """Simple cURL parser integrated directly."""
+        """Simple cURL parser integrated directly.
+
+        Results are cached per command string and shared between callers, so
+        the returned dict must be treated as read-only.
+        """
+        parsed_curl = self._curl_cache.get(curl_command)
+        if parsed_curl is None:
+            parsed_curl = self._parse_curl(curl_command)
+            self._curl_cache[curl_command] = parsed_curl
+        return parsed_curl
+
+    def _parse_curl(self, curl_command: str) -> dict[str, Any]:
+        """Parse a cURL command into method, url, headers, body and query."""
         curl_command = curl_command.strip()
         if curl_command.startswith("curl "):
             curl_command = curl_command[5:]
 
-        try:
-            tokens = shlex.split(curl_command)
-        except ValueError:
-            tokens = curl_command.split()
+        tokens = tokenize_curl(curl_command)
 
         method = "GET"
         url = ""
         headers = {}
         body = None
 
+        n = len(tokens)
         i = 0
-        while i < len(tokens):
+        while i < n:
             token = tokens[i]
 
-            if token in self.method_flags and i + 1 < len(tokens):
-                method = tokens[i + 1].upper()
-                i += 2
-                continue
-
-            if token in self.header_flags and i + 1 < len(tokens):
-                header_value = tokens[i + 1]
-                if ":" in header_value:
-                    header_name, header_val = header_value.split(":", 1)
-                    headers[header_name.strip()] = header_val.strip()
-                i += 2
-                continue
-
-            if token in self.data_flags and i + 1 < len(tokens):
-                body = tokens[i + 1]
-                if method == "GET":
-                    method = "POST"
-                i += 2
-                continue
-
-            if token in self.json_flags and i + 1 < len(tokens):
-                body = tokens[i + 1]
-                headers["Content-Type"] = "application/json"
-                if method == "GET":
-                    method = "POST"
-                i += 2
-                continue
-
-            if token.startswith("-"):
-                if i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
-                    i += 2
-                else:
+            # one dict lookup tells which kind of flag (if any) this is
+            kind = _FLAG_KIND.get(token) if i + 1 < n else None
+            match kind:
+                case "method":
+                    method = tokens[i + 1].upper()
+                case "header":
+                    header_name, sep, header_val = tokens[i + 1].partition(":")
+                    if sep:
+                        headers[header_name.strip()] = header_val.strip()
+                case "data" | "json":
+                    body = tokens[i + 1]
+                    if kind == "json":
+                        headers["Content-Type"] = "application/json"
+                    if method == "GET":
+                        method = "POST"
+                case _:
+                    if token.startswith("-"):
+                        if i + 1 < n and not tokens[i + 1].startswith("-"):
+                            i += 2
+                        else:
+                            i += 1
+                        continue
+
+                    if not url:
+                        url = token
+
                     i += 1
-                continue
+                    continue
+
+            i += 2
+
+        return {
+            "method": method,
+            "headers": headers,
+            "body": body,
+            **self._parse_url(url),
+        }
 
-            if not url and not token.startswith("-"):
-                url = token
+    def _parse_url(self, url: str) -> dict[str, Any]:
+        """Split a URL into its base, query parameters and Postman segments.
 
-            i += 1
+        The split result is kept so converting the request does not have to
+        parse the URL again. Host and path segments are tuples since parse
+        results are cached and shared.
+        """
+        raw_url = url
+        try:
+            parsed_url = urlsplit(url)
+        except ValueError:
+            # e.g. an unbalanced IPv6 bracket; the URL is only kept as written
+            # (url and raw_url) and has no host, path or query components
+            parsed_url = SplitResult("", "", "", "", "")
+        netloc = parsed_url.netloc
+        path = parsed_url.path
 
         # parse query parameters
         query_params = {}
-        if "?" in url:
-            parsed_url = urlparse(url)
-            query_params = {
-                k: v[0] if v else "" for k, v in parse_qs(parsed_url.query).items()
-            }
-            url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
+        query_pairs = ()
+        if parsed_url.query:
+            # the first value of a repeated key wins in query_params, as in
+            # CurlConverter; query_pairs keeps them all to match the raw URL
+            query_pairs = tuple(parse_qsl(parsed_url.query, keep_blank_values=True))
+            for key, value in query_pairs:
+                query_params.setdefault(key, value)
+            url = f"{parsed_url.scheme}://{netloc}{path}"
 
         return {
-            "method": method,
             "url": url,
-            "headers": headers,
-            "body": body,
+            # URL exactly as written in the command, query string included
+            "raw_url": raw_url,
             "query_params": query_params,
+            "query_pairs": query_pairs,
+            "parsed_url": parsed_url,
+            "host_parts": tuple(netloc.split(".")) if netloc else (),
+            "path_parts": (
+                tuple(path.strip("/").split("/")) if path and path != "/" else ()
+            ),
         }
 
-    def extract_postman_variables(self, text: str) -> list[str]:
-        """Extract Postman variable names from text."""
-        if not text:
-            return []
-        matches = self.postman_var_pattern.findall(text)
-        return list(set(matches))
+    def extract_postman_variables(self, text: str) -> frozenset[str]:
+        """Extract the unique Postman variable names from text."""
+        return extract_postman_variables(text)
 
     def build_collection(
         self,
         requests: list[Any],
         collection_name: str = "Generated Collection",
         collection_description: str = "Collection generated from Markdown",
+        max_workers: int | None = None,
+        collection_id: str | None = None,
     ) -> dict[str, Any]:
-        """Build a complete Postman Collection v2.1 JSON."""
+        """Build a complete Postman Collection v2.1 JSON.
+
+        Requests are converted serially; pass ``max_workers`` above 1 to
+        convert them on a single thread pool of that many threads instead.
+        Conversion is pure Python that holds the GIL, so the pool is not
+        expected to make it faster.
+
+        ``collection_id`` is used as the ``_postman_id``; a random UUID is
+        generated when it is not given.
+        """
+        # drop cached parses from earlier builds
+        self._curl_cache.clear()
 
         # Group requests by folder
-        folders = {}
+        folders: dict[str, list[Any]] = defaultdict(list)
         flat_requests = []
 
         for parsed_request in requests:
-            if hasattr(parsed_request, "folder") and parsed_request.folder:
-                if parsed_request.folder not in folders:
-                    folders[parsed_request.folder] = []
-                folders[parsed_request.folder].append(parsed_request)
+            folder = getattr(parsed_request, "folder", None)
+            if folder:
+                folders[folder].append(parsed_request)
             else:
                 flat_requests.append(parsed_request)
 
@@ -130,36 +251,77 @@ class PostmanCollectionBuilder:
             "info": {
                 "name": collection_name,
                 "description": collection_description,
-                "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
-                "_postman_id": str(uuid.uuid4()),
+                "schema": _SCHEMA_URL,
+                "_postman_id": collection_id or str(uuid.uuid4()),
                 "_exporter_id": "markdown-to-postman",
             },
             "item": [],
-            "variable": self._extract_all_variables(requests),
+            "variable": [],
             "event": [],
         }
 
-        # Add flat requests first
-        for parsed_request in flat_requests:
-            postman_request = self._convert_request(parsed_request)
-            collection["item"].append(postman_request)
-
-        # Add folder-grouped requests
-        for folder_name, folder_requests in folders.items():
-            folder_item = {"name": folder_name, "item": []}
+        # collect the Postman variables used across all requests while they
+        # are converted
+        all_variables: set[str] = set()
+
+        # one pool for the whole build, shared by every group of requests
+        with (
+            ThreadPoolExecutor(max_workers=max_workers)
+            if max_workers is not None and max_workers > 1
+            else nullcontext()
+        ) as executor:
+            # Add flat requests first
+            collection["item"].extend(
+                self._convert_requests(flat_requests, all_variables, executor)
+            )
 
-            for parsed_request in folder_requests:
-                postman_request = self._convert_request(parsed_request)
-                folder_item["item"].append(postman_request)
+            # Add folder-grouped requests
+            for folder_name, folder_requests in folders.items():
+                folder_item = {
+                    "name": folder_name,
+                    "item": self._convert_requests(
+                        folder_requests, all_variables, executor
+                    ),
+                }
+                collection["item"].append(folder_item)
 
-            collection["item"].append(folder_item)
+        # Convert to Postman variable format
+        collection["variable"] = [
+            {"key": var_name, "value": "", "type": "string"}
+            for var_name in sorted(all_variables)
+        ]
 
         return collection
 
-    def _convert_request(self, parsed_request: Any) -> dict[str, Any]:
-        """Convert a ParsedRequest to Postman request format."""
+    def _convert_requests(
+        self,
+        requests: list[Any],
+        all_variables: set[str],
+        executor: ThreadPoolExecutor | None = None,
+    ) -> list[dict[str, Any]]:
+        """Convert requests to Postman format, in order.
+
+        The variables each request uses are added to ``all_variables``.
+        Requests are converted on ``executor`` when one is given.
+        """
+        convert = executor.map if executor is not None else map
+        results = convert(self._convert_request, requests)
+
+        items = []
+        for postman_request, request_variables in results:
+            items.append(postman_request)
+            all_variables |= request_variables
+        return items
+
+    def _convert_request(self, parsed_request: Any) -> tuple[dict[str, Any], set[str]]:
+        """Convert a ParsedRequest to Postman request format.
+
+        Returns the Postman request together with the names of the Postman
+        variables it uses.
+        """
         # Parse the cURL command
         parsed_curl = self.parse_curl_simple(parsed_request.curl_command)
+        variables = self._collect_variables(parsed_curl)
 
         # Build headers array
         headers_array = []
@@ -170,45 +332,23 @@ class PostmanCollectionBuilder:
 
         # Build query parameters array
         query_array = []
-        for param_name, param_value in parsed_curl["query_params"].items():
+        for param_name, param_value in parsed_curl["query_pairs"]:
             query_array.append({"key": param_name, "value": param_value})
 
         # Build request body
-        body = None
-        if parsed_curl["body"]:
-            try:
-                json_data = json.loads(parsed_curl["body"])
-                body = {
-                    "mode": "raw",
-                    "raw": json.dumps(json_data, indent=2),
-                    "options": {"raw": {"language": "json"}},
-                }
-            except (json.JSONDecodeError, TypeError):
-                body = {"mode": "raw", "raw": parsed_curl["body"]}
+        body = self._build_body(parsed_curl["body"]) if parsed_curl["body"] else None
 
-        parsed_url = urlparse(parsed_curl["url"])
         request = {
             "name": parsed_request.name,
             "request": {
                 "method": parsed_curl["method"],
                 "header": headers_array,
                 "url": {
-                    "raw": parsed_curl["url"]
-                    + (
-                        "?"
-                        + "&".join(
-                            f"{k}={v}" for k, v in parsed_curl["query_params"].items()
-                        )
-                        if parsed_curl["query_params"]
-                        else ""
-                    ),
-                    "protocol": parsed_url.scheme or "https",
-                    "host": (parsed_url.netloc or "").split(".")
-                    if parsed_url.netloc
-                    else [],
-                    "path": (parsed_url.path or "/").strip("/").split("/")
-                    if parsed_url.path and parsed_url.path != "/"
-                    else [],
+                    "raw": parsed_curl["raw_url"],
+                    "protocol": parsed_curl["parsed_url"].scheme or "https",
+                    # fresh lists, so items never share the cached segments
+                    "host": list(parsed_curl["host_parts"]),
+                    "path": list(parsed_curl["path_parts"]),
                     "query": query_array,
                 },
             },
@@ -217,116 +357,105 @@ class PostmanCollectionBuilder:
         if body:
             request["request"]["body"] = body
 
-        if hasattr(parsed_request, "metadata") and parsed_request.metadata.description:
-            request["request"]["description"] = parsed_request.metadata.description
+        metadata = getattr(parsed_request, "metadata", None)
+        if metadata is not None:
+            if metadata.description:
+                request["request"]["description"] = metadata.description
 
-        # Add test script if save_response_variable is specified
-        if (
-            hasattr(parsed_request, "metadata")
-            and parsed_request.metadata.save_response_variable
-        ):
-            test_script = self._generate_save_variable_script(
-                parsed_request.metadata.save_response_variable
-            )
-            request["event"] = [
-                {
-                    "listen": "test",
-                    "script": {"type": "text/javascript", "exec": test_script},
-                }
-            ]
+            events = []
 
-        # Add pre-request script if requires is specified
-        if hasattr(parsed_request, "metadata") and parsed_request.metadata.requires:
-            prereq_script = self._generate_prereq_script(
-                parsed_request.metadata.requires
-            )
-            if "event" not in request:
-                request["event"] = []
-            request["event"].append(
-                {
-                    "listen": "prerequest",
-                    "script": {"type": "text/javascript", "exec": prereq_script},
-                }
-            )
+            # Add test script if save_response_variable is specified
+            if metadata.save_response_variable:
+                variables.add(metadata.save_response_variable)
+                test_script = self._generate_save_variable_script(
+                    metadata.save_response_variable
+                )
+                events.append(
+                    {
+                        "listen": "test",
+                        "script": {"type": "text/javascript", "exec": test_script},
+                    }
+                )
+
+            # Add pre-request script if requires is specified
+            if metadata.requires:
+                prereq_script = self._generate_prereq_script(metadata.requires)
+                events.append(
+                    {
+                        "listen": "prerequest",
+                        "script": {"type": "text/javascript", "exec": prereq_script},
+                    }
+                )
 
-        return request
+            if events:
+                request["event"] = events
 
-    def _extract_all_variables(self, requests: list[Any]) -> list[dict[str, Any]]:
-        """Extract all unique Postman variables from all requests."""
-        all_variables = set()
+        return request, variables
 
-        for parsed_request in requests:
-            parsed_curl = self.parse_curl_simple(parsed_request.curl_command)
+    def _build_body(self, raw_body: str) -> dict[str, Any]:
+        """Build a raw Postman body, flagged as JSON for JSON objects and arrays."""
+        if not may_be_json_body(raw_body):
+            return {"mode": "raw", "raw": raw_body}
+        try:
+            orjson.loads(raw_body)
+        except orjson.JSONDecodeError:
+            return {"mode": "raw", "raw": raw_body}
 
-            # Check URL
-            all_variables.update(self.extract_postman_variables(parsed_curl["url"]))
+        # the body is kept as written unless re-indenting was asked for
+        if self.pretty_json_bodies:
+            raw_body = reindent_json(raw_body)
+        return {
+            "mode": "raw",
+            "raw": raw_body,
+            "options": {"raw": {"language": "json"}},
+        }
 
-            # Check headers
-            for header_name, header_value in parsed_curl["headers"].items():
-                all_variables.update(self.extract_postman_variables(header_name))
-                all_variables.update(self.extract_postman_variables(header_value))
+    def _collect_variables(self, parsed_curl: dict[str, Any]) -> set[str]:
+        """Collect the Postman variables used in a parsed cURL command."""
+        variables = set()
+        harvest = harvest_postman_variables
 
-            # Check body
-            if parsed_curl["body"]:
-                all_variables.update(
-                    self.extract_postman_variables(parsed_curl["body"])
-                )
+        # Check URL
+        harvest(parsed_curl["url"], variables)
 
-            # Check query parameters
-            for param_name, param_value in parsed_curl["query_params"].items():
-                all_variables.update(self.extract_postman_variables(param_name))
-                all_variables.update(self.extract_postman_variables(param_value))
+        # Check headers
+        for header_name, header_value in parsed_curl["headers"].items():
+            harvest(header_name, variables)
+            harvest(header_value, variables)
 
-            # Add variables from metadata
-            if (
-                hasattr(parsed_request, "metadata")
-                and parsed_request.metadata.save_response_variable
-            ):
-                all_variables.add(parsed_request.metadata.save_response_variable)
+        # Check body
+        harvest(parsed_curl["body"], variables)
 
-        # Convert to Postman variable format
-        postman_variables = []
-        for var_name in sorted(all_variables):
-            postman_variables.append({"key": var_name, "value": "", "type": "string"})
+        # Check query parameters
+        for param_name, param_value in parsed_curl["query_pairs"]:
+            harvest(param_name, variables)
+            harvest(param_value, variables)
 
-        return postman_variables
+        return variables
 
     def _generate_save_variable_script(self, variable_name: str) -> list[str]:
         """Generate test script to save response data to a variable."""
-        return [
-            "// Save response data to variable",
-            "const responseJson = pm.response.json();",
-            (
-                f"pm.environment.set('{variable_name}', "
-                "responseJson.token || "
-                "responseJson.access_token || "
-                "responseJson.id || "
-                "JSON.stringify(responseJson)"
-                ");"
-            ),
-        ]
+        return list(_save_variable_script(variable_name))
 
     def _generate_prereq_script(self, required_vars: str) -> list[str]:
         """Generate pre-request script to check required variables."""
-        vars_list = [var.strip() for var in required_vars.split(",")]
-        script_lines = ["// Check required variables"]
-
-        for var in vars_list:
-            script_lines.extend(
-                [
-                    f"if (!pm.environment.get('{var}')) {{",
-                    f"    throw new Error('Required variable {var} is not set');",
-                    "}",
-                ]
-            )
-
-        return script_lines
-
-    def save_collection(self, collection: dict[str, Any], file_path: str) -> None:
-        """Save collection to JSON file."""
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(collection, file, indent=2, ensure_ascii=False)
-
-    def get_collection_json(self, collection: dict[str, Any]) -> str:
-        """Get collection as JSON string."""
-        return json.dumps(collection, indent=2, ensure_ascii=False)
+        return list(_prereq_script(required_vars))
+
+    def save_collection(
+        self, collection: dict[str, Any], file_path: str, pretty: bool = True
+    ) -> None:
+        """Save collection to JSON file.
+
+        Pass ``pretty=False`` to write compact JSON without indentation.
+        """
+        with open(file_path, "wb") as file:
+            file.write(_dumps_bytes(collection, option=_dumps_option(pretty)))
+
+    def get_collection_json(
+        self, collection: dict[str, Any], pretty: bool = True
+    ) -> str:
+        """Get collection as JSON string.
+
+        Pass ``pretty=False`` to get compact JSON without indentation.
+        """
+        return _dumps_bytes(collection, option=_dumps_option(pretty)).decode()
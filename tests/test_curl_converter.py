@@ -0,0 +1,42 @@
+"""
+Tests for the cURL tokenizer and converter.
+"""
+
+import shlex
+import unittest
+
+from md_to_postman.curl_converter import tokenize_curl
+
+
+class TokenizeCurlTest(unittest.TestCase):
+    def test_matches_shlex(self):
+        commands = [
+            "curl https://api.example.com/users",
+            "curl -X POST 'https://a/b?x=1&y={{v}}' -H \"Accept: */*\"",
+            "curl -d '{\"name\": \"a b\"}' -H 'Authorization: Bearer {{token}}'",
+            'curl -d "{\\"quoted\\": \\"\\\\\\"}" https://a',
+            "curl -d ''  https://a \t\r\n",
+            # only ' \t\r\n' separate words, as in shlex
+            "curl https://a/\xa0b \x0bc\x0cd\x85 e f\xa0",
+            # fall back to shlex for escapes outside quotes and glued words
+            "curl https://a/b\\ c -d a'b'c",
+            "curl -d 'unbalanced",
+        ]
+        for command in commands:
+            with self.subTest(command=command):
+                try:
+                    expected = shlex.split(command)
+                except ValueError:
+                    expected = command.split()
+                self.assertEqual(tokenize_curl(command), expected)
+
+    def test_line_continuations_are_whitespace(self):
+        command = "curl -X POST \\\n  https://a \\\n  -d 'x'"
+
+        self.assertEqual(
+            tokenize_curl(command), ["curl", "-X", "POST", "https://a", "-d", "x"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
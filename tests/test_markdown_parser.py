@@ -0,0 +1,37 @@
+"""
+Tests for the markdown parser.
+"""
+
+import unittest
+
+from md_to_postman.markdown_parser import MarkdownParser
+
+
+class MarkdownParserTest(unittest.TestCase):
+    def test_comment_in_other_fence_is_not_a_heading(self):
+        markdown = (
+            "# F\n"
+            "## A\n"
+            "**Description:** x\n"
+            "\n"
+            "```bash\n"
+            "# install\n"
+            "pip x\n"
+            "```\n"
+            "\n"
+            "```curl\n"
+            "curl https://a\n"
+            "```\n"
+        )
+
+        requests = MarkdownParser().parse(markdown)
+
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0].name, "A")
+        self.assertEqual(requests[0].folder, "F")
+        self.assertEqual(requests[0].metadata.description, "x")
+        self.assertEqual(requests[0].curl_command, "curl https://a")
+
+
+if __name__ == "__main__":
+    unittest.main()
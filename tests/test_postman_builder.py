@@ -0,0 +1,32 @@
+"""
+Tests for the Postman collection builder.
+"""
+
+import unittest
+
+from md_to_postman.markdown_parser import ParsedRequest, RequestMetadata
+from md_to_postman.postman_builder import PostmanCollectionBuilder
+
+
+class PostmanCollectionBuilderTest(unittest.TestCase):
+    def test_malformed_url_is_kept_as_written(self):
+        request = ParsedRequest(
+            name="A",
+            metadata=RequestMetadata(),
+            curl_command="curl 'http://[::1/x?a={{v}}'",
+        )
+
+        collection = PostmanCollectionBuilder().build_collection([request])
+
+        url = collection["item"][0]["request"]["url"]
+        self.assertEqual(url["raw"], "http://[::1/x?a={{v}}")
+        self.assertEqual(url["host"], [])
+        self.assertEqual(url["path"], [])
+        self.assertEqual(url["query"], [])
+        self.assertEqual(
+            collection["variable"], [{"key": "v", "value": "", "type": "string"}]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()